@@ -0,0 +1,538 @@
+# Shared data loading, statistics and panel helpers for the dashboard apps
+# (my_first_app.py and test.py)
+import io
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+
+# matplotlib, seaborn, plotly and scipy are imported where they are first
+# needed, so a cold start with nothing uploaded doesn't wait on them.
+# Set seaborn style (once per server process, not on every rerun)
+@st.cache_resource(show_spinner=False)
+def mpl_init():
+    import matplotlib
+    matplotlib.use("Agg")  # headless backend, skips GUI backend probing
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("whitegrid")
+    plt.rcParams.update({
+        "axes.titlesize": 14,
+        "axes.labelsize": 12,
+        "xtick.labelsize": 10,
+        "ytick.labelsize": 10
+    })
+    return True
+
+
+# CSV uploads above this size are summarised chunk by chunk instead of
+# being loaded into a single DataFrame. Must stay below Streamlit's upload
+# cap (server.maxUploadSize, 200 MB by default) or the path is unreachable
+STREAM_THRESHOLD_BYTES = 100 * 1024 * 1024
+
+
+class StreamingStats:
+    # Running per-column count / sum plus cross-products,
+    # updated one chunk at a time. Cross-products use rows that are complete
+    # in every column, shifted by the first chunk's means so that
+    # E[XY] - E[X]E[Y] doesn't lose precision on large values.
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.rows = 0
+        self.n = np.zeros(k)
+        self.sum = np.zeros(k)
+        self.shift = None
+        self.n_xy = 0
+        self.sum_c = np.zeros(k)
+        self.sum_xy = np.zeros((k, k))
+
+    def update(self, chunk: pd.DataFrame):
+        X = chunk[self.columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        self.rows += len(X)
+        mask = ~np.isnan(X)
+        self.n += mask.sum(axis=0)
+        self.sum += np.nansum(X, axis=0)
+
+        complete = X[mask.all(axis=1)]
+        if len(complete):
+            if self.shift is None:
+                self.shift = complete.mean(axis=0)
+            D = complete - self.shift
+            self.n_xy += len(D)
+            self.sum_c += D.sum(axis=0)
+            self.sum_xy += D.T @ D
+
+    def kpis(self) -> pd.DataFrame:
+        # Same layout as df.agg(["sum", "mean"])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = self.sum / self.n
+        return pd.DataFrame({"sum": self.sum, "mean": mean}, index=self.columns).T
+
+    def corr(self) -> pd.DataFrame:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = self.sum_c / self.n_xy
+            cov = self.sum_xy / self.n_xy - np.outer(mean, mean)
+            std = np.sqrt(np.diag(cov))
+            C = np.clip(cov / np.outer(std, std), -1.0, 1.0)
+        return pd.DataFrame(C, index=self.columns, columns=self.columns)
+
+
+# --- Cached Helpers ---
+# Streamlit reruns the whole script on every widget change; these keep the
+# expensive parsing / dtype scans / correlations out of the rerun path.
+@st.cache_data(show_spinner=False)
+def load_data(file_bytes: bytes, name: str) -> pd.DataFrame:
+    # Keyed on the raw upload bytes, so the same file is only parsed once.
+    # Prefer the multithreaded Arrow / Rust readers, falling back to the
+    # default engines if they are missing or choke on the file.
+    if name.endswith(".csv"):
+        try:
+            df = pd.read_csv(io.BytesIO(file_bytes), engine="pyarrow")
+        except (ImportError, ValueError):
+            df = pd.read_csv(io.BytesIO(file_bytes))
+    else:
+        try:
+            # Its XmlError/ZipError/... derive from CalamineError, not ValueError
+            from python_calamine import CalamineError
+        except ImportError:
+            CalamineError = ValueError
+        try:
+            df = pd.read_excel(io.BytesIO(file_bytes), engine="calamine")
+        except (ImportError, ValueError, CalamineError):
+            df = pd.read_excel(io.BytesIO(file_bytes))
+
+    # Low-cardinality text columns become categoricals, so unique/groupby/
+    # equality work on integer codes instead of hashing Python strings.
+    # "string" picks up pandas 3's default str columns without relying on
+    # the deprecated object-includes-str behaviour. Mixed columns (e.g. 101
+    # and "A7" from a spreadsheet) are skipped: their categories can't be
+    # serialised to Arrow for st.dataframe or Parquet
+    for c in df.select_dtypes(include=["object", "string"]).columns:
+        if pd.api.types.infer_dtype(df[c], skipna=True) != "string":
+            continue
+        if len(df) and df[c].nunique(dropna=True) / len(df) < 0.5:
+            df[c] = df[c].astype("category")
+
+    # Narrowest integer dtypes (int8/16/32) so reductions touch fewer bytes.
+    # Floats stay float64: float32 can't hold cents on totals above ~16.7M
+    for c in df.select_dtypes(include=["integer"]).columns:
+        df[c] = pd.to_numeric(df[c], downcast="integer")
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def stream_csv(file_bytes: bytes) -> tuple:
+    # One pass over the CSV in 1M-row chunks; only the first 1,000 rows are
+    # kept as a DataFrame, everything else is folded into StreamingStats
+    preview, summary = pd.DataFrame(), StreamingStats([])
+    for i, chunk in enumerate(pd.read_csv(io.BytesIO(file_bytes), chunksize=1_000_000, engine="c")):
+        if i == 0:
+            preview = chunk.head(1000)
+            summary = StreamingStats(chunk.select_dtypes(include=["number"]).columns)
+        summary.update(chunk)
+    return preview, summary.rows, summary.kpis(), summary.corr()
+
+
+@st.cache_data(show_spinner=False)
+def plot_sample(df: pd.DataFrame, n: int = 10_000) -> pd.DataFrame:
+    # Point plots only need enough rows to show the shape of the data;
+    # statistics are still computed on the full frame
+    return df if len(df) <= n else df.sample(n, random_state=0)
+
+
+def get_fig(key: str, size: tuple = (6.4, 4.8)):
+    # Reuse this session's Figure for a chart (cleared) instead of allocating
+    # a new Figure/Axes tree on every rerun. Built with Figure() rather than
+    # plt.subplots so pyplot's global registry doesn't keep it alive after
+    # the session ends
+    mpl_init()
+    from matplotlib.figure import Figure
+
+    fig = st.session_state.get(key)
+    if fig is None or fig.get_size_inches().tolist() != list(size):
+        fig = Figure(figsize=size)
+        ax = fig.add_subplot()
+        st.session_state[key] = fig
+    else:
+        ax = fig.axes[0]
+        ax.clear()
+    return fig, ax
+
+
+def to_parquet_bytes(df: pd.DataFrame):
+    # Snapshot of the parsed frame; reading it back skips CSV/XLSX parsing.
+    # Returns None (no snapshot) if pyarrow is missing or can't convert a
+    # column, e.g. a mixed int/str column from a spreadsheet. pyarrow's
+    # conversion errors subclass these builtins
+    buffer = io.BytesIO()
+    try:
+        df.to_parquet(buffer, compression="zstd")
+    except (ImportError, ValueError, TypeError, NotImplementedError):
+        return None
+    return buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False)
+def read_parquet_bytes(blob: bytes) -> pd.DataFrame:
+    # Rehydrated sessions hit this on every rerun, so decode each blob once
+    return pd.read_parquet(io.BytesIO(blob))
+
+
+@st.cache_data(show_spinner=False)
+def classify_cols(df: pd.DataFrame) -> tuple:
+    # (categorical, numeric) column names; every panel reuses this result.
+    # The pyarrow CSV engine parses timestamps into datetime64 where the C
+    # engine left them as text, so dates are listed as categorical to keep
+    # them available for grouping and the category charts
+    categorical = df.select_dtypes(
+        include=["object", "string", "category", "datetime", "datetimetz"]
+    ).columns.tolist()
+    numeric = df.select_dtypes(include=["number"]).columns.tolist()
+    return categorical, numeric
+
+
+def compute_pearson(df_num: pd.DataFrame) -> pd.DataFrame:
+    # Pearson as one GEMM over mean-centred, unit-norm columns.
+    # pandas uses pairwise-complete rows when values are missing, which a
+    # single matmul can't reproduce, so frames with NaNs take that path.
+    X = df_num.to_numpy(dtype=np.float64, copy=True)
+    if np.isnan(X).any():
+        return df_num.corr(method="pearson")
+    X -= X.mean(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        X /= np.linalg.norm(X, axis=0)
+    C = np.clip(X.T @ X, -1.0, 1.0)
+    return pd.DataFrame(C, index=df_num.columns, columns=df_num.columns)
+
+
+@st.cache_data(show_spinner=False)
+def compute_corr(df: pd.DataFrame, cols: tuple, method: str) -> pd.DataFrame:
+    if method == "pearson":
+        return compute_pearson(df[list(cols)])
+    return df[list(cols)].corr(method=method)
+
+
+@st.cache_data(show_spinner=False)
+def compute_corr_pvalues(df: pd.DataFrame, cols: tuple) -> pd.DataFrame:
+    # p-values for the same r the heatmap shows: t = r * sqrt((n-2)/(1-r^2))
+    # with n the pairwise-complete row count, so it matches pandas' NaN
+    # handling and needs no second pass over the data
+    from scipy import stats
+
+    r = compute_corr(df, cols, "pearson").to_numpy()
+    present = df[list(cols)].notna().to_numpy(dtype=np.float64)
+    n = present.T @ present
+    if (n < 3).all():
+        return None
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dof = np.where(n >= 3, n - 2, np.nan)
+        t_stat = r * np.sqrt(dof / (1 - r ** 2))
+        p_values = 2 * stats.t.sf(np.abs(t_stat), dof)
+    return pd.DataFrame(p_values, index=list(cols), columns=list(cols))
+
+
+@st.cache_data(show_spinner=False)
+def group_moments(df: pd.DataFrame, gcol: str, ncol: str) -> pd.DataFrame:
+    # mean / var / count of every group in one groupby pass, so switching
+    # Group 1 / Group 2 is a row lookup rather than a rescan
+    g = df.groupby(gcol, observed=True, sort=False)[ncol]
+    return g.agg(["mean", "var", "count"])
+
+
+def welch_ttest(m1: float, v1: float, n1: int, m2: float, v2: float, n2: int) -> tuple:
+    # Welch's t-test from summary statistics; matches
+    # stats.ttest_ind(..., equal_var=False) on the raw samples
+    from scipy import stats
+
+    a, b = v1 / n1, v2 / n2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_stat = (m1 - m2) / np.sqrt(a + b)
+        dof = (a + b) ** 2 / (a ** 2 / (n1 - 1) + b ** 2 / (n2 - 1))
+    p_value = 2 * stats.t.sf(np.abs(t_stat), dof)
+    return t_stat, dof, p_value
+
+
+@st.cache_data(show_spinner=False)
+def pairwise_welch(moments: pd.DataFrame) -> pd.DataFrame:
+    # p-values for every pair of groups at once; welch_ttest broadcasts
+    # over the k x k grid of cached moments
+    valid = moments[moments["count"] > 1]
+    m, v, n = (valid[c].to_numpy(dtype=np.float64) for c in ("mean", "var", "count"))
+    _, _, p_values = welch_ttest(m[:, None], v[:, None], n[:, None], m[None, :], v[None, :], n[None, :])
+    labels = valid.index.astype(str)
+    return pd.DataFrame(p_values, index=labels, columns=labels)
+
+
+@st.cache_resource(show_spinner=False)
+def render_heatmap(corr_df: pd.DataFrame, method: str):
+    # cache_resource hands back the same Figure instead of pickling it
+    import plotly.express as px
+
+    fig = px.imshow(
+        corr_df,
+        text_auto=".2f",
+        color_continuous_scale="YlGnBu",
+        aspect="auto",
+        title=f"Correlation Matrix ({method.title()})"
+    )
+    return fig
+
+
+# --- Dashboard Panels ---
+# Each panel is a fragment, so changing one of its widgets reruns only
+# that panel instead of the whole script.
+@st.fragment
+def kpi_panel(df: pd.DataFrame, numeric_cols: list):
+    # --- Beautiful Auto KPI Section ---
+    st.subheader("🌈 Beautiful Auto KPIs Dashboard")
+
+    if len(numeric_cols) == 0:
+        st.warning("⚠️ No numerical columns found to calculate KPIs.")
+    else:
+        # Select top 3 numeric columns (you can change number)
+        top_numeric = numeric_cols[:3]
+
+        # Custom CSS for beautiful KPI cards
+        st.markdown("""
+            <style>
+            .kpi-card {
+                background: linear-gradient(135deg, #3498db, #8e44ad);
+                padding: 20px;
+                border-radius: 18px;
+                color: white;
+                text-align: center;
+                box-shadow: 0 4px 10px rgba(0,0,0,0.2);
+                transition: all 0.3s ease-in-out;
+            }
+            .kpi-card:hover {
+                transform: scale(1.05);
+                box-shadow: 0 8px 20px rgba(0,0,0,0.3);
+            }
+            .kpi-label {
+                font-size: 18px;
+                font-weight: 600;
+            }
+            .kpi-value {
+                font-size: 26px;
+                font-weight: bold;
+                margin-top: 5px;
+            }
+            .kpi-delta {
+                font-size: 15px;
+                color: #f5f5f5;
+            }
+            </style>
+        """, unsafe_allow_html=True)
+
+        # Display KPI cards
+        cols = st.columns(len(top_numeric))
+        bg_colors = ["linear-gradient(135deg, #1ABC9C, #16A085)",
+                     "linear-gradient(135deg, #3498DB, #2E86C1)",
+                     "linear-gradient(135deg, #E67E22, #D35400)"]
+
+        # One fused reduction for every KPI instead of a sum + mean per column
+        stats_df = df[top_numeric].agg(["sum", "mean"])
+
+        for i, col_name in enumerate(top_numeric):
+            col_sum = stats_df.at["sum", col_name]
+            col_mean = stats_df.at["mean", col_name]
+
+            with cols[i]:
+                st.markdown(
+                    f"""
+                    <div class="kpi-card" style="background:{bg_colors[i % len(bg_colors)]}">
+                        <div class="kpi-label">📊 {col_name}</div>
+                        <div class="kpi-value">{col_sum:,.2f}</div>
+                        <div class="kpi-delta">Avg: {col_mean:,.2f}</div>
+                    </div>
+                    """,
+                    unsafe_allow_html=True
+                )
+
+        # --- Summary KPIs (Dataset Info) ---
+        st.divider()
+        st.markdown("### 📘 Dataset Overview")
+
+        summary_cols = st.columns(3)
+        with summary_cols[0]:
+            st.metric("🧾 Total Rows", f"{df.shape[0]:,}")
+        with summary_cols[1]:
+            st.metric("📚 Total Columns", f"{df.shape[1]:,}")
+        with summary_cols[2]:
+            missing = df.isna().to_numpy().mean() * 100
+            st.metric("⚠️ Missing Data (%)", f"{missing:.2f}%")
+
+
+@st.fragment
+def corr_panel(df: pd.DataFrame, numeric_cols: list):
+    st.subheader("📈 Correlation Analysis")
+    corr_method = st.selectbox("Select Correlation Method", ["pearson", "spearman", "kendall"])
+    if len(numeric_cols) >= 2:
+        corr_matrix = compute_corr(df, tuple(numeric_cols), corr_method)
+        st.plotly_chart(render_heatmap(corr_matrix, corr_method), use_container_width=True)
+
+        if corr_method == "pearson":
+            p_values = compute_corr_pvalues(df, tuple(numeric_cols))
+            if p_values is not None:
+                with st.expander("Show correlation p-values"):
+                    st.dataframe(p_values.round(4), use_container_width=True)
+
+
+@st.fragment
+def ttest_panel(df: pd.DataFrame, categorical_cols: list, numeric_cols: list, show_interpretation: bool = False):
+    import plotly.express as px
+
+    st.subheader("🎯 Independent T-Test Analysis")
+    if categorical_cols and numeric_cols:
+        group_col = st.selectbox("Grouping Column", categorical_cols)
+        numeric_col = st.selectbox("Numeric Column for T-Test", numeric_cols)
+
+        # Categorical columns already know their levels; only plain object
+        # columns need a scan
+        if isinstance(df[group_col].dtype, pd.CategoricalDtype):
+            groups = df[group_col].cat.categories.to_numpy()
+        else:
+            groups = df[group_col].dropna().unique()
+        if len(groups) >= 2:
+            group1 = st.selectbox("Select Group 1", groups)
+            group2 = st.selectbox("Select Group 2", groups)
+
+            moments = group_moments(df, group_col, numeric_col)
+            mean1, var1, n1 = moments.loc[group1, ["mean", "var", "count"]]
+            mean2, var2, n2 = moments.loc[group2, ["mean", "var", "count"]]
+
+            if n1 > 1 and n2 > 1:
+                t_stat, dof, p_value = welch_ttest(mean1, var1, n1, mean2, var2, n2)
+
+                result_cols = st.columns(3)
+                result_cols[0].metric("📊 t-statistic", f"{t_stat:.4f}")
+                result_cols[1].metric("📐 Degrees of Freedom", f"{dof:.1f}")
+                result_cols[2].metric("📉 p-value", f"{p_value:.4f}")
+
+                st.markdown("### 📝 Observation & Insights")
+                if p_value < 0.05:
+                    st.success("✅ Statistically Significant Difference Found (p < 0.05)")
+                    st.markdown(
+                        f"""
+                            On average, <b style='color:#1A5276'>{group1}</b> ({mean1:.2f}) 
+                            vs <b style='color:#B03A2E'>{group2}</b> ({mean2:.2f}), 
+                            the difference is <b style='color:green;'>statistically significant</b>.
+                            """,
+                        unsafe_allow_html=True
+                    )
+                else:
+                    # Not statistically significant
+                    st.warning("⚠️ No Statistically Significant Difference (p ≥ 0.05)")
+                    st.markdown(
+                        f"""
+                            On average, <b style='color:#1A5276'>{group1}</b> ({mean1:.2f}) 
+                            vs <b style='color:#B03A2E'>{group2}</b> ({mean2:.2f}), 
+                            the difference is <b style='color:red;'>not statistically significant</b>.
+                            """,
+                        unsafe_allow_html=True
+                    )
+
+                # Mean comparison chart
+                fig = px.bar(
+                    x=[str(group1), str(group2)],
+                    y=[mean1, mean2],
+                    color=[str(group1), str(group2)],
+                    color_discrete_sequence=px.colors.qualitative.Set2,
+                    labels={"x": group_col, "y": f"Mean of {numeric_col}"},
+                    title="Mean Comparison"
+                )
+                fig.update_layout(showlegend=False)
+                st.plotly_chart(fig, use_container_width=True)
+
+                if show_interpretation:
+                    st.markdown("### 📊 Plot Interpretation")
+
+                    if mean1 > mean2:
+                        st.write(f"""
+                    The bar chart shows that **{group1}** has a higher average **{numeric_col}**
+                    compared to **{group2}**.
+
+                    This suggests that the grouping variable **{group_col}** may influence
+                    the values of **{numeric_col}**.
+                    """)
+                    else:
+                        st.write(f"""
+                    The bar chart shows that **{group2}** has a higher average **{numeric_col}**
+                    compared to **{group1}**.
+
+                    This suggests that the grouping variable **{group_col}** may influence
+                    the values of **{numeric_col}**.
+                    """)
+            else:
+                st.error("Not enough data points in one of the groups.")
+
+            if len(groups) <= 30:
+                with st.expander("Compare all group pairs (p-values)"):
+                    st.dataframe(pairwise_welch(moments).round(4), use_container_width=True)
+
+
+def streaming_panel(preview: pd.DataFrame, n_rows: int, kpis: pd.DataFrame, corr_matrix: pd.DataFrame):
+    st.warning("⚠️ Large file: showing a streamed summary (preview, KPIs and Pearson correlation) "
+               "without loading the full dataset.")
+
+    st.subheader("🔎 Data Preview")
+    st.dataframe(preview, use_container_width=True)
+
+    st.subheader("🌈 Beautiful Auto KPIs Dashboard")
+    summary_cols = st.columns(2)
+    summary_cols[0].metric("🧾 Total Rows", f"{n_rows:,}")
+    summary_cols[1].metric("📚 Total Columns", f"{preview.shape[1]:,}")
+
+    top_numeric = kpis.columns[:3].tolist()
+    if top_numeric:
+        cols = st.columns(len(top_numeric))
+        for i, col_name in enumerate(top_numeric):
+            cols[i].metric(f"📊 {col_name}", f"{kpis.at['sum', col_name]:,.2f}")
+            cols[i].caption(f"Avg: {kpis.at['mean', col_name]:,.2f}")
+
+    if len(corr_matrix.columns) >= 2:
+        st.subheader("📈 Correlation Analysis")
+        st.plotly_chart(render_heatmap(corr_matrix, "pearson"), use_container_width=True)
+
+
+def profit_quantity_panel(df: pd.DataFrame):
+    import plotly.express as px
+
+    st.subheader("📊 Profit vs Quantity")
+    xy = df[["Quantity", "Profit"]].dropna()
+    x, y = xy["Quantity"].to_numpy(), xy["Profit"].to_numpy()
+    # A trend line needs at least two complete rows
+    has_trend = len(xy) >= 2
+    if has_trend:
+        slope, intercept = np.polyfit(x, y, 1)
+        x_line = np.linspace(x.min(), x.max(), 100)
+    if len(xy) > 5000:
+        # Large frames: bin into hexagons server-side rather than
+        # shipping one marker per row to the browser
+        fig, ax = get_fig("profit_quantity_fig", (7, 5))
+        ax.hexbin(x, y, gridsize=60, cmap="Blues", mincnt=1)
+        if has_trend:
+            ax.plot(x_line, slope * x_line + intercept, "r-")
+        ax.set_xlabel("Quantity")
+        ax.set_ylabel("Profit")
+        ax.set_title("Profit vs Quantity with Regression Line", fontsize=13, color="#1B2631")
+        st.pyplot(fig)
+    else:
+        fig = px.scatter(
+            xy, x="Quantity", y="Profit", opacity=0.6,
+            color_discrete_sequence=["#2E86C1"],
+            title="Profit vs Quantity with Regression Line"
+        )
+        if has_trend:
+            fig.add_scatter(x=x_line, y=slope * x_line + intercept, mode="lines",
+                            line_color="red", name="Regression")
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown(
+        "<div style='background-color:#FFF3CD; padding:15px; border-radius:10px; color:#856404;'>"
+        "</div>",
+        unsafe_allow_html=True
+    )
@@ -1,10 +1,9 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-import google.generativeai as genai
+from dashboard_helpers import (
+    STREAM_THRESHOLD_BYTES, load_data, stream_csv, to_parquet_bytes, read_parquet_bytes, get_fig, mpl_init,
+    classify_cols, kpi_panel, corr_panel, ttest_panel, streaming_panel, profit_quantity_panel,
+    plot_sample
+)
 # Anil and Chandan work in progress
 # --- Streamlit Page Setup ---
 st.set_page_config(
@@ -13,15 +12,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Set seaborn style
-sns.set_style("whitegrid")
-plt.rcParams.update({
-    "axes.titlesize": 14,
-    "axes.labelsize": 12,
-    "xtick.labelsize": 10,
-    "ytick.labelsize": 10
-})
-
 # --- Title ---
 st.markdown(
     """
@@ -38,22 +28,39 @@ st.markdown(
 # --- File Upload ---
 uploaded_file = st.file_uploader("📂 Upload your data file", type=["csv", "xlsx"])
 
-if uploaded_file:
-    # Detect file type
-    if uploaded_file.name.endswith(".csv"):
-        df = pd.read_csv(uploaded_file)
-    else:
-        df = pd.read_excel(uploaded_file)
-
+df = None
+if uploaded_file and uploaded_file.name.endswith(".csv") and uploaded_file.size > STREAM_THRESHOLD_BYTES:
+    # The streamed file replaces whatever snapshot an earlier upload left
+    for key in ("df_parquet", "df_file_id", "df_name"):
+        st.session_state.pop(key, None)
     st.success(f"✅ File `{uploaded_file.name}` loaded successfully!")
+    streaming_panel(*stream_csv(uploaded_file.getvalue()))
+elif uploaded_file:
+    # Parse once per upload (cached on file contents)
+    df = load_data(uploaded_file.getvalue(), uploaded_file.name)
+
+    # Keep a Parquet copy in the session so the data survives the uploader
+    # being cleared without another parse
+    if st.session_state.get("df_file_id") != uploaded_file.file_id:
+        st.session_state["df_parquet"] = to_parquet_bytes(df)
+        st.session_state["df_file_id"] = uploaded_file.file_id
+        st.session_state["df_name"] = uploaded_file.name
+elif st.session_state.get("df_parquet") is not None:
+    df = read_parquet_bytes(st.session_state["df_parquet"])
+
+if df is not None:
+    # Plotting libraries are only needed once there is data to show
+    mpl_init()
+    import seaborn as sns
+
+    st.success(f"✅ File `{st.session_state['df_name']}` loaded successfully!")
 
     # --- Data Preview ---
     st.subheader("🔎 Data Preview")
     st.dataframe(df.head(), use_container_width=True)
 
     # Separate categorical and numeric columns
-    categorical_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
-    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
+    categorical_cols, numeric_cols = classify_cols(df)
 
     st.markdown(
         f"<p style='color:#1F618D'><b>Detected Categorical Columns:</b> {', '.join(categorical_cols) if categorical_cols else 'None'}</p>",
@@ -64,188 +71,13 @@ if uploaded_file:
         unsafe_allow_html=True
     )
 
-    # --- KPIs ---
-    # --- Beautiful Auto KPI Section ---
-    st.subheader("🌈 Beautiful Auto KPIs Dashboard")
-
-    numeric_cols = df.select_dtypes(include=["number"]).columns.tolist()
-
-    if len(numeric_cols) == 0:
-        st.warning("⚠️ No numerical columns found to calculate KPIs.")
-    else:
-        # Select top 3 numeric columns (you can change number)
-        top_numeric = numeric_cols[:3]
-
-        # Custom CSS for beautiful KPI cards
-        st.markdown("""
-            <style>
-            .kpi-card {
-                background: linear-gradient(135deg, #3498db, #8e44ad);
-                padding: 20px;
-                border-radius: 18px;
-                color: white;
-                text-align: center;
-                box-shadow: 0 4px 10px rgba(0,0,0,0.2);
-                transition: all 0.3s ease-in-out;
-            }
-            .kpi-card:hover {
-                transform: scale(1.05);
-                box-shadow: 0 8px 20px rgba(0,0,0,0.3);
-            }
-            .kpi-label {
-                font-size: 18px;
-                font-weight: 600;
-            }
-            .kpi-value {
-                font-size: 26px;
-                font-weight: bold;
-                margin-top: 5px;
-            }
-            .kpi-delta {
-                font-size: 15px;
-                color: #f5f5f5;
-            }
-            </style>
-        """, unsafe_allow_html=True)
-
-        # Display KPI cards
-        cols = st.columns(len(top_numeric))
-        bg_colors = ["linear-gradient(135deg, #1ABC9C, #16A085)",
-                     "linear-gradient(135deg, #3498DB, #2E86C1)",
-                     "linear-gradient(135deg, #E67E22, #D35400)"]
-
-        for i, col_name in enumerate(top_numeric):
-            col_sum = df[col_name].sum(skipna=True)
-            col_mean = df[col_name].mean(skipna=True)
-
-            with cols[i]:
-                st.markdown(
-                    f"""
-                    <div class="kpi-card" style="background:{bg_colors[i % len(bg_colors)]}">
-                        <div class="kpi-label">📊 {col_name}</div>
-                        <div class="kpi-value">{col_sum:,.2f}</div>
-                        <div class="kpi-delta">Avg: {col_mean:,.2f}</div>
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
-
-        # --- Summary KPIs (Dataset Info) ---
-        st.divider()
-        st.markdown("### 📘 Dataset Overview")
-
-        summary_cols = st.columns(3)
-        with summary_cols[0]:
-            st.markdown(
-                """
-                <div class="kpi-card" style="background:linear-gradient(135deg,#9B59B6,#8E44AD);">
-                    <div class="kpi-label">🧾 Total Rows</div>
-                    <div class="kpi-value">{:,}</div>
-                </div>
-                """.format(df.shape[0]),
-                unsafe_allow_html=True
-            )
-        with summary_cols[1]:
-            st.markdown(
-                """
-                <div class="kpi-card" style="background:linear-gradient(135deg,#E74C3C,#C0392B);">
-                    <div class="kpi-label">📚 Total Columns</div>
-                    <div class="kpi-value">{:,}</div>
-                </div>
-                """.format(df.shape[1]),
-                unsafe_allow_html=True
-            )
-
-        # Show summary KPIs for dataset
-        st.divider()
-        summary_cols = st.columns(3)
-        with summary_cols[0]:
-            st.metric("🧾 Total Rows", f"{df.shape[0]:,}")
-        with summary_cols[1]:
-            st.metric("📚 Total Columns", f"{df.shape[1]:,}")
-        with summary_cols[2]:
-            missing = df.isnull().mean().mean() * 100
-            st.metric("⚠️ Missing Data (%)", f"{missing:.2f}%")
-
-    # --- Correlation ---
-    st.subheader("📈 Correlation Analysis")
-    corr_method = st.selectbox("Select Correlation Method", ["pearson", "spearman", "kendall"])
-    if len(numeric_cols) >= 2:
-        corr_matrix = df[numeric_cols].corr(method=corr_method)
-        fig, ax = plt.subplots(figsize=(8, 5))
-        sns.heatmap(corr_matrix, annot=True, cmap="YlGnBu", fmt=".2f", linewidths=0.5, ax=ax)
-        ax.set_title(f"Correlation Matrix ({corr_method.title()})", fontsize=14, color="#2E4053")
-        st.pyplot(fig)
-
-    # --- Independent T-Test ---
-    st.subheader("🎯 Independent T-Test Analysis")
-    if categorical_cols and numeric_cols:
-        group_col = st.selectbox("Grouping Column", categorical_cols)
-        numeric_col = st.selectbox("Numeric Column for T-Test", numeric_cols)
-
-        groups = df[group_col].dropna().unique()
-        if len(groups) >= 2:
-            group1 = st.selectbox("Select Group 1", groups)
-            group2 = st.selectbox("Select Group 2", groups)
-
-            data1 = df[df[group_col] == group1][numeric_col].dropna()
-            data2 = df[df[group_col] == group2][numeric_col].dropna()
-
-            if len(data1) > 1 and len(data2) > 1:
-                t_stat, p_value = stats.ttest_ind(data1, data2, equal_var=False)
-
-                result_cols = st.columns(3)
-                result_cols[0].metric("📊 t-statistic", f"{t_stat:.4f}")
-                result_cols[1].metric("📐 Degrees of Freedom", f"{len(data1) + len(data2) - 2}")
-                result_cols[2].metric("📉 p-value", f"{p_value:.4f}")
-
-                mean1, mean2 = data1.mean(), data2.mean()
-                st.markdown("### 📝 Observation & Insights")
-                if p_value < 0.05:
-                    st.success("✅ Statistically Significant Difference Found (p < 0.05)")
-                    st.markdown(
-                        f"""
-                            On average, <b style='color:#1A5276'>{group1}</b> ({mean1:.2f}) 
-                            vs <b style='color:#B03A2E'>{group2}</b> ({mean2:.2f}), 
-                            the difference is <b style='color:green;'>statistically significant</b>.
-                            """,
-                        unsafe_allow_html=True
-                    )
-                else:
-                    # Not statistically significant
-                    st.warning("⚠️ No Statistically Significant Difference (p ≥ 0.05)")
-                    st.markdown(
-                        f"""
-                            On average, <b style='color:#1A5276'>{group1}</b> ({mean1:.2f}) 
-                            vs <b style='color:#B03A2E'>{group2}</b> ({mean2:.2f}), 
-                            the difference is <b style='color:red;'>not statistically significant</b>.
-                            """,
-                        unsafe_allow_html=True
-                    )
-
-                # Mean comparison chart
-                fig, ax = plt.subplots(figsize=(5, 4))
-                sns.barplot(x=[group1, group2], y=[mean1, mean2], palette="Set2", ax=ax)
-                ax.set_ylabel(f"Mean of {numeric_col}")
-                ax.set_title("Mean Comparison", fontsize=13, color="#2C3E50")
-                st.pyplot(fig)
-            else:
-                st.error("Not enough data points in one of the groups.")
+    kpi_panel(df, numeric_cols)
+    corr_panel(df, numeric_cols)
+    ttest_panel(df, categorical_cols, numeric_cols)
 
     # --- Profit vs Quantity Plot (Generic) ---
     if "Quantity" in df.columns and "Profit" in df.columns:
-        st.subheader("📊 Profit vs Quantity")
-        fig, ax = plt.subplots(figsize=(7, 5))
-        sns.scatterplot(data=df, x="Quantity", y="Profit", hue=None, alpha=0.6, s=60, color="#2E86C1")
-        sns.regplot(data=df, x="Quantity", y="Profit", scatter=False, color="red", ax=ax)
-        ax.set_title("Profit vs Quantity with Regression Line", fontsize=13, color="#1B2631")
-        st.pyplot(fig)
-
-        st.markdown(
-            "<div style='background-color:#FFF3CD; padding:15px; border-radius:10px; color:#856404;'>"
-            "</div>",
-            unsafe_allow_html=True
-        )
+        profit_quantity_panel(df)
 
         # --- Auto Visualization Section ---
         st.subheader("📊 Automatic Visualizations with Insights")
@@ -269,8 +101,10 @@ if uploaded_file:
 
                 count_data = df[selected_cat].value_counts().head(10)
 
-                fig, ax = plt.subplots()
-                sns.barplot(x=count_data.values, y=count_data.index, ax=ax)
+                fig, ax = get_fig("bar_fig")
+                # Plain string labels: a CategoricalIndex would make seaborn draw
+                # every category in lexical order instead of the top 10
+                sns.barplot(x=count_data.values, y=count_data.index.astype(str), ax=ax)
                 ax.set_title(f"Top Categories in {selected_cat}")
                 st.pyplot(fig)
 
@@ -290,8 +124,8 @@ if uploaded_file:
 
                 pie_data = df[selected_cat].value_counts().head(5)
 
-                fig, ax = plt.subplots()
-                ax.pie(pie_data, labels=pie_data.index, autopct='%1.1f%%')
+                fig, ax = get_fig("pie_fig")
+                ax.pie(pie_data, labels=pie_data.index.astype(str), autopct='%1.1f%%')
                 ax.set_title(f"{selected_cat} Distribution")
                 st.pyplot(fig)
 
@@ -307,7 +141,7 @@ if uploaded_file:
             if selected_num != "None":
                 st.markdown("### 📈 Histogram")
 
-                fig, ax = plt.subplots()
+                fig, ax = get_fig("hist_fig")
                 sns.histplot(df[selected_num], kde=True, ax=ax)
                 ax.set_title(f"Distribution of {selected_num}")
                 st.pyplot(fig)
@@ -324,7 +158,7 @@ if uploaded_file:
             if selected_num != "None":
                 st.markdown("### 📉 Line Chart")
 
-                fig, ax = plt.subplots()
+                fig, ax = get_fig("line_fig")
                 df[selected_num].plot(ax=ax)
                 ax.set_title(f"Trend of {selected_num}")
                 st.pyplot(fig)
@@ -341,7 +175,7 @@ if uploaded_file:
             if selected_num != "None":
                 st.markdown("### 📦 Box Plot")
 
-                fig, ax = plt.subplots()
+                fig, ax = get_fig("box_fig")
                 sns.boxplot(x=df[selected_num], ax=ax)
                 ax.set_title(f"Boxplot of {selected_num}")
                 st.pyplot(fig)
@@ -361,8 +195,8 @@ if uploaded_file:
                 x_col = st.selectbox("X-axis", numeric_cols, key="scatter_x")
                 y_col = st.selectbox("Y-axis", numeric_cols, key="scatter_y")
 
-                fig, ax = plt.subplots()
-                sns.scatterplot(data=df, x=x_col, y=y_col, ax=ax)
+                fig, ax = get_fig("scatter_fig")
+                sns.scatterplot(data=plot_sample(df), x=x_col, y=y_col, ax=ax)
                 ax.set_title(f"{x_col} vs {y_col}")
                 st.pyplot(fig)
 
@@ -373,7 +207,7 @@ if uploaded_file:
                 - Correlation: **{corr:.2f}**
                 - {'Positive relationship' if corr > 0 else 'Negative relationship' if corr < 0 else 'No strong relationship'}
                 """)
-else:
+elif uploaded_file is None:
     st.info("👆 Please upload a CSV or XLSX file to begin.")
 # ==================================
 # 🤖 Data Chat Assistant
@@ -429,12 +263,15 @@ else:
     #             """
     #         )
 # Gemini Configuration
-# Access Gemini API key from Streamlit secrets
-GEMINI_API_KEY = st.secrets["gemini"]["api_key"]
-
-genai.configure(api_key=GEMINI_API_KEY)
+# Imported and configured once per process, on the first question, so the
+# SDK stays off the cold-start path and out of ordinary reruns
+@st.cache_resource(show_spinner=False)
+def _gemini_model():
+    import google.generativeai as genai
 
-model = genai.GenerativeModel("gemini-2.5-flash")
+    # Access Gemini API key from Streamlit secrets
+    genai.configure(api_key=st.secrets["gemini"]["api_key"])
+    return genai.GenerativeModel("gemini-2.5-flash")
 
 
 # ==================================
@@ -444,13 +281,14 @@ model = genai.GenerativeModel("gemini-2.5-flash")
 st.divider()
 st.subheader("🤖 My Data Assistant")
 
-if uploaded_file:
+if df is not None:
 
     user_question = st.chat_input(
         "Ask anything about your uploaded dataset..."
     )
 
     if user_question:
+        model = _gemini_model()
 
         with st.chat_message("user"):
             st.write(user_question)